@@ -1,25 +1,38 @@
 import logging
 import os
-import shutil
+from typing import Any
+
+from photo_organizer.utils import move_unique_file
 
 logger = logging.getLogger(__name__)
 
 
 def log_and_handle_error(
-    destination_dir: str, file: str, file_dir: str, error_message: str
+    unknown_dir: str,
+    file: str,
+    file_dir: str,
+    error_message: str,
+    *args: Any,
+    same_device: bool = False,
+) -> None:
+    """
+    Logs why a file could not be organized and moves it into `unknown_dir`.
+
+    `error_message` completes the sentence "File <file> at location <file_dir> ..." and
+    may contain %-style placeholders for `args`, formatted only if the record is logged.
+    """
+    logger.error("File %s at location %s " + error_message, file, file_dir, *args)
+    handle_error_cases(unknown_dir, file, file_dir, same_device)
+
+
+def handle_error_cases(
+    unknown_dir: str, file: str, file_dir: str, same_device: bool = False
 ) -> None:
-    logger.error(error_message)
-    handle_error_cases(destination_dir, file, file_dir)
-
-
-def handle_error_cases(destination_dir: str, file: str, file_dir: str) -> None:
-    file_destination: str = os.path.join(destination_dir, "Unknown", file)
-    folder_destination: str = os.path.join(destination_dir, "Unknown")
-    if not os.path.exists(folder_destination):
-        os.makedirs(folder_destination)
-    if not os.path.exists(file_destination):
-        logger.debug("Moving file %s to %s", file, file_destination)
-        shutil.copy(file_dir, file_destination)
-        os.remove(file_dir)
-    else:
-        os.remove(file_dir)
+    """
+    Moves a file that could not be organized into `unknown_dir`, which must exist.
+
+    The directory is created once per run by `organize`, so errors skip `makedirs`.
+    """
+    file_destination: str = os.path.join(unknown_dir, file)
+    logger.debug("Moving file %s to %s", file, file_destination)
+    move_unique_file(file_dir, file_destination, same_device)
@@ -1,8 +1,128 @@
-from exif import Image
+import struct
+from typing import BinaryIO, Dict, NamedTuple, Optional, Tuple
 
+# Large enough for the SOI, an APP0 segment and a maximum-size (64 KiB) APP1 segment.
+EXIF_HEADER_BYTES = 128 * 1024
 
-def extract_exif_data(image_file):
-    my_image = Image(image_file)
+EXIF_IFD_POINTER = 0x8769
+DATETIME_ORIGINAL = 0x9003
+DATETIME_DIGITIZED = 0x9004
+ASCII_TYPE = 2
+
+_APP1_EXIF_HEADER = b"Exif\x00\x00"
+_SEGMENT_LENGTH = struct.Struct(">H")
+
+
+class _TiffStructs(NamedTuple):
+    uint16: struct.Struct
+    uint32: struct.Struct
+    ifd_entry: struct.Struct
+
+
+_TIFF_BYTE_ORDERS = {
+    b"II": _TiffStructs(
+        struct.Struct("<H"), struct.Struct("<I"), struct.Struct("<HHI4s")
+    ),
+    b"MM": _TiffStructs(
+        struct.Struct(">H"), struct.Struct(">I"), struct.Struct(">HHI4s")
+    ),
+}
+
+IfdEntry = Tuple[int, int, bytes]
+
+
+def _find_exif_segment(header: bytes) -> Optional[memoryview]:
+    """
+    Returns the TIFF structure in the JPEG APP1 Exif segment, as a view into `header`.
+
+    Only the segment markers are walked, so no image data is touched. Returns an empty
+    view if the JPEG reaches its image data without an Exif segment, and None if
+    `header` is not a JPEG or the segment is not completely contained in it.
+    """
+    if header[:2] != b"\xff\xd8":
+        return None
+    cursor = 2
+    while cursor + 4 <= len(header):
+        if header[cursor] != 0xFF:
+            return None
+        marker = header[cursor + 1]
+        if marker == 0xFF:  # fill byte
+            cursor += 1
+            continue
+        if marker == 0xDA or marker == 0xD9:  # image data or end of image
+            return memoryview(b"")
+        (length,) = _SEGMENT_LENGTH.unpack_from(header, cursor + 2)
+        segment_end = cursor + 2 + length
+        if marker == 0xE1 and header[cursor + 4 : cursor + 10] == _APP1_EXIF_HEADER:
+            if segment_end > len(header):
+                return None
+            return memoryview(header)[cursor + 10 : segment_end]
+        cursor = segment_end
+    return None
+
+
+def _read_ifd(
+    tiff: memoryview, offset: int, structs: _TiffStructs
+) -> Dict[int, IfdEntry]:
+    (entry_count,) = structs.uint16.unpack_from(tiff, offset)
+    entries: Dict[int, IfdEntry] = {}
+    for tag, value_type, count, value in structs.ifd_entry.iter_unpack(
+        tiff[offset + 2 : offset + 2 + 12 * entry_count]
+    ):
+        entries[tag] = (value_type, count, value)
+    return entries
+
+
+def _read_ascii(
+    tiff: memoryview, entry: IfdEntry, structs: _TiffStructs
+) -> Optional[str]:
+    value_type, count, value = entry
+    if value_type != ASCII_TYPE:
+        return None
+    if count > 4:
+        (offset,) = structs.uint32.unpack(value)
+        value = bytes(tiff[offset : offset + count])
+    return value[:count].rstrip(b"\x00 ").decode("ascii") or None
+
+
+def read_exif_datetime(tiff: memoryview) -> Optional[str]:
+    """
+    Reads DateTimeOriginal, or failing that DateTimeDigitized, from a TIFF structure.
+
+    Only IFD0 and the Exif IFD are read and only the date tags are decoded. Raises
+    ValueError or struct.error on malformed data.
+    """
+    structs = _TIFF_BYTE_ORDERS.get(bytes(tiff[:2]))
+    if structs is None:
+        raise ValueError("Invalid TIFF byte order in EXIF segment")
+    (ifd0_offset,) = structs.uint32.unpack_from(tiff, 4)
+    ifds = [_read_ifd(tiff, ifd0_offset, structs)]
+    if EXIF_IFD_POINTER in ifds[0]:
+        (exif_offset,) = structs.uint32.unpack(ifds[0][EXIF_IFD_POINTER][2])
+        ifds.insert(0, _read_ifd(tiff, exif_offset, structs))
+    for tag in (DATETIME_ORIGINAL, DATETIME_DIGITIZED):
+        for ifd in ifds:
+            if tag in ifd:
+                datetime_value = _read_ascii(tiff, ifd[tag], structs)
+                if datetime_value:
+                    return datetime_value
+    return None
+
+
+def extract_exif_data(image_file: BinaryIO) -> Optional[str]:
+    header = image_file.read(EXIF_HEADER_BYTES)
+    tiff = _find_exif_segment(header)
+    if tiff is not None:
+        return read_exif_datetime(tiff) if tiff else None
+
+    # Not a plain JPEG layout; let the exif library search for the segment. It is slow
+    # to import, so it is only loaded when a file gets this far.
+    from exif import Image
+
+    my_image = Image(header)
+    if not my_image.has_exif and len(header) == EXIF_HEADER_BYTES:
+        # The EXIF segment may start further in; fall back to parsing the whole file.
+        my_image = Image(header + image_file.read())
     if my_image.has_exif:
         datetime_original = (
             my_image.get("datetime_original")
@@ -1,12 +1,12 @@
 import logging
 from typing import Optional
 
-from PIL import Image as PILImage
-
 logger = logging.getLogger(__name__)
 
 
 def extract_gif_creation_date(file_path: str) -> Optional[str]:
+    from PIL import Image as PILImage
+
     try:
         img = PILImage.open(file_path)
         info = img.info
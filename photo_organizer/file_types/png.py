@@ -1,12 +1,60 @@
 import logging
-from typing import Optional
+import os
+import struct
+from typing import BinaryIO, Optional
 
-from PIL import Image as PILImage
+from photo_organizer.exif import read_exif_datetime
 
 logger = logging.getLogger(__name__)
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_CHUNK_HEADER = struct.Struct(">I4s")
+# Some writers copy the JPEG APP1 prefix into the chunk.
+_EXIF_PREFIX = b"Exif\x00\x00"
+
+
+def _read_exif_chunk(png_file: BinaryIO) -> Optional[bytes]:
+    """
+    Returns the contents of the `eXIf` chunk of a PNG file, or None if it has none.
+
+    Only chunk headers are read; the data of every other chunk is seeked over. The
+    search stops at the first `IDAT` chunk, as `eXIf` is written before the image data
+    and reading on would mean walking the whole file.
+    """
+    if png_file.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+        return None
+    while True:
+        header = png_file.read(_CHUNK_HEADER.size)
+        if len(header) < _CHUNK_HEADER.size:
+            return None
+        length, chunk_type = _CHUNK_HEADER.unpack(header)
+        if chunk_type == b"eXIf":
+            return png_file.read(length)
+        if chunk_type == b"IDAT" or chunk_type == b"IEND":
+            return None
+        png_file.seek(length + 4, os.SEEK_CUR)  # chunk data and CRC
+
+
+def _extract_exif_creation_date(file_path: str) -> Optional[str]:
+    with open(file_path, "rb") as png_file:
+        tiff = _read_exif_chunk(png_file)
+    if not tiff:
+        return None
+    if tiff.startswith(_EXIF_PREFIX):
+        tiff = tiff[len(_EXIF_PREFIX) :]
+    return read_exif_datetime(memoryview(tiff))
+
 
 def extract_png_creation_date(file_path: str) -> Optional[str]:
+    try:
+        creation_date = _extract_exif_creation_date(file_path)
+        if creation_date:
+            return creation_date
+    except (ValueError, struct.error) as e:
+        logger.error("Error reading PNG EXIF data: %s", e)
+
+    from PIL import Image as PILImage
+
     try:
         img = PILImage.open(file_path)
         info = img.info
@@ -15,5 +63,5 @@ def extract_png_creation_date(file_path: str) -> Optional[str]:
         elif "date:create" in info:
             return info["date:create"]
     except Exception as e:
-        logger.error(f"Error extracting PNG creation date: {e}")
+        logger.error("Error extracting PNG creation date: %s", e)
     return None
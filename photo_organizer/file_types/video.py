@@ -0,0 +1,95 @@
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional, Tuple
+
+# QuickTime/ISO base media timestamps count seconds from this epoch.
+QUICKTIME_EPOCH = datetime(1904, 1, 1)
+
+
+def _find_box(
+    video_file: BinaryIO, start: int, end: int, box_type: bytes
+) -> Optional[Tuple[int, int]]:
+    """
+    Returns the `(payload_start, payload_end)` offsets of the first `box_type` box
+    between `start` and `end`, seeking over the payload of every other box.
+    """
+    while start + 8 <= end:
+        video_file.seek(start)
+        size, current_type = struct.unpack(">I4s", video_file.read(8))
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack(">Q", video_file.read(8))
+            header_size = 16
+        elif size == 0:
+            size = end - start
+        if size < header_size:
+            return None
+        if current_type == box_type:
+            return start + header_size, min(start + size, end)
+        start += size
+    return None
+
+
+def _read_mvhd_creation_time(video_file: BinaryIO) -> Optional[int]:
+    """
+    Returns the creation time stored in the `moov/mvhd` box of an MP4/QuickTime file, in
+    seconds since `QUICKTIME_EPOCH`, or None if the file has no such box.
+    """
+    end = video_file.seek(0, os.SEEK_END)
+    moov = _find_box(video_file, 0, end, b"moov")
+    if not moov:
+        return None
+    mvhd = _find_box(video_file, moov[0], moov[1], b"mvhd")
+    if not mvhd:
+        return None
+    video_file.seek(mvhd[0])
+    version = video_file.read(4)[0]
+    if version == 1:
+        (creation_time,) = struct.unpack(">Q", video_file.read(8))
+    else:
+        (creation_time,) = struct.unpack(">I", video_file.read(4))
+    return creation_time
+
+
+def _extract_hachoir_creation_date(file_path: str) -> Optional[str]:
+    # hachoir registers every parser it ships with on import, so only load it when a
+    # file actually needs it.
+    from hachoir.metadata import extractMetadata
+    from hachoir.parser import createParser
+
+    parser = createParser(file_path)
+    if not parser:
+        return None
+    with parser:
+        metadata = extractMetadata(parser)
+    if metadata and metadata.has("creation_date"):
+        creation_date: Optional[datetime] = metadata.get("creation_date")
+        if creation_date:
+            return creation_date.strftime("%Y:%m:%d %H:%M:%S")
+    return None
+
+
+def extract_video_creation_date(file_path: str) -> Optional[str]:
+    """
+    Returns the creation date of a video file as a `YYYY:MM:DD HH:MM:SS` string.
+
+    MP4/QuickTime containers (MOV, MP4, M4V, 3GP) are read by seeking straight to the
+    movie header box. Other containers such as AVI, and files whose box structure cannot
+    be followed, are parsed with hachoir.
+    """
+    try:
+        with open(file_path, "rb") as video_file:
+            creation_time = _read_mvhd_creation_time(video_file)
+    except (struct.error, IndexError):
+        creation_time = None
+    if creation_time is None:
+        return _extract_hachoir_creation_date(file_path)
+    if not creation_time:
+        return None
+    try:
+        creation_date = QUICKTIME_EPOCH + timedelta(seconds=creation_time)
+    except OverflowError:
+        # A corrupt 64-bit timestamp beyond the year 9999.
+        return _extract_hachoir_creation_date(file_path)
+    return creation_date.strftime("%Y:%m:%d %H:%M:%S")
@@ -1,9 +1,10 @@
+import logging
 import platform
 from logging.config import dictConfig
 from pathlib import Path
 from typing import Optional
 
-FORMAT = "%(asctime)s {app} [%(thread)d] %(levelname)-5s %(name)s - %(message)s. [file=%(filename)s:%(lineno)d]"
+FORMAT = "%(asctime)s {app} %(levelname)-5s %(name)s - %(message)s. [file=%(filename)s:%(lineno)d]"
 DATE_FORMAT = None
 
 
@@ -12,6 +13,11 @@ def setup_logging(
 ) -> None:
     formatted = fmt.format(app=name)
 
+    # Thread and process ids are not in the format; skip collecting them per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     if log_dir is None:
         if platform.system() == "Windows":
             log_dir = Path(r"C:/Users/sherd/Documents/GitHub/photo_organizer")
@@ -42,8 +48,16 @@ def setup_logging(
                 "filename": str(log_dir / "photo_organizer.log"),
                 "formatter": "standard",
             },
+            # Batches writes to the log file; errors and shutdown flush immediately.
+            "buffered_file": {
+                "class": "logging.handlers.MemoryHandler",
+                "capacity": 1000,
+                "flushLevel": logging.ERROR,
+                "target": "file",
+                "level": level,
+            },
         },
-        "loggers": {"": {"handlers": ["default", "file"], "level": level}},
+        "loggers": {"": {"handlers": ["default", "buffered_file"], "level": level}},
     }
 
     dictConfig(logging_config)
@@ -1,26 +1,340 @@
 import logging
 import os
-import shutil
-from datetime import datetime
+import sys
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from struct import error as UnpackError
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
 
 from photo_organizer.error_handling import log_and_handle_error
 from photo_organizer.exif import extract_exif_data
-from photo_organizer.file_types.avi import extract_avi_creation_date
 from photo_organizer.file_types.gif import extract_gif_creation_date
-from photo_organizer.file_types.m4v import extract_m4v_creation_date
-from photo_organizer.file_types.mov import extract_mov_creation_date
-from photo_organizer.file_types.mp4 import extract_mp4_creation_date
 from photo_organizer.file_types.png import extract_png_creation_date
-from photo_organizer.file_types.threegp import extract_3gp_creation_date
-from photo_organizer.utils import parse_args
+from photo_organizer.file_types.video import extract_video_creation_date
+from photo_organizer.utils import is_same_device, move_unique_file, parse_args
 
 logger = logging.getLogger(__name__)
+_folder_contents_lock = threading.Lock()
+
+# Lowercased names of system files that are deleted instead of organized.
+FILES_TO_DELETE = frozenset({".ds_store", "desktop", "thumbs.db"})
+FILE_TYPE_EXTRACTORS: Dict[str, Callable[[str], Optional[str]]] = {
+    ".3gp": extract_video_creation_date,
+    ".avi": extract_video_creation_date,
+    ".gif": extract_gif_creation_date,
+    ".m4v": extract_video_creation_date,
+    ".mov": extract_video_creation_date,
+    ".mp4": extract_video_creation_date,
+    ".png": extract_png_creation_date,
+}
+# Bound once so each lookup skips the global and attribute loads.
+_get_extractor = FILE_TYPE_EXTRACTORS.get
+UNKNOWN_DIR_NAME = "Unknown"
+EXIF_EXTENSIONS = frozenset({".jfif", ".jpe", ".jpeg", ".jpg"})
+# The SOI marker and the start of the first segment of a JPEG file.
+JPEG_MAGIC = b"\xff\xd8\xff"
+# Workers mostly wait on disk I/O, so use more threads than cores.
+DEFAULT_MAX_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+# Files queued per worker, so workers never wait on the directory walk.
+PENDING_FILES_PER_WORKER = 4
+PROGRESS_EVERY_FILES = 500
+PROGRESS_EVERY_SECONDS = 5.0
+
+
+def should_skip_file(file: str) -> bool:
+    """
+    Returns True for system files that should be deleted instead of organized.
+
+    Names are matched case-insensitively.
+    """
+    return file.lower() in FILES_TO_DELETE
+
+
+def _iter_files(origin_dir: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    Lazily yields `(file_path, file_name, file_ext)` for every file below `origin_dir`.
+
+    The extension is lowercased and interned so callers can dispatch on it directly; the
+    handful of distinct extensions in a library then share one string object each. Files
+    within a directory are yielded grouped by extension, so runs of the same type go
+    through the same extractor back to back.
+
+    Directories are read with `os.scandir`, whose entries carry the file type reported
+    by the directory listing, so no extra `stat` is needed to tell files from
+    subdirectories. System files listed in `FILES_TO_DELETE` are deleted as they are
+    found instead of being yielded.
+    """
+    try:
+        with os.scandir(origin_dir) as it:
+            dir_entries = list(it)
+    except OSError as e:
+        logger.error("Could not read directory %s. Error: %s", origin_dir, e)
+        return
+
+    files = []
+    subdirs = []
+    for entry in dir_entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file():
+            if should_skip_file(entry.name):
+                os.remove(entry.path)
+                continue
+            dot = entry.name.rfind(".")
+            file_ext = sys.intern(entry.name[dot:].lower()) if dot > 0 else ""
+            files.append((file_ext, entry.name, entry.path))
+    files.sort()
+    for file_ext, file, file_dir in files:
+        yield file_dir, file, file_ext
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+
+def _remove_empty_dirs(origin_dir: str) -> None:
+    """
+    Removes empty directories below `origin_dir`, deepest first.
+
+    Runs after all files are processed so directories emptied by moves are removed too.
+    The bottom-up walk already lists each directory's contents, so a directory is known
+    to be empty when it has no files and all its subdirectories were already removed.
+    """
+    removed: Set[str] = set()
+    for root, subdirs, files in os.walk(origin_dir, topdown=False):
+        if root == origin_dir or files:
+            continue
+        if all(os.path.join(root, subdir) in removed for subdir in subdirs):
+            try:
+                os.rmdir(root)
+            except OSError as e:
+                logger.debug("Could not remove directory %s. Error: %s", root, e)
+                continue
+            removed.add(root)
+            logger.debug("Removing directory %s", root)
+
+
+def _parse_year_month(datetime_original: str) -> Tuple[str, str]:
+    """
+    Returns the zero-padded `(year, month)` of a `YYYY:MM:DD HH:MM:SS` timestamp.
+
+    Only the fixed-position year and month fields are read, which avoids building a
+    datetime for every file. Raises ValueError if they do not form a valid date.
+    """
+    year, month = datetime_original[0:4], datetime_original[5:7]
+    if not (
+        year.isdigit()
+        and month.isdigit()
+        and datetime_original[4:5] == ":"
+        and "0001" <= year
+        and "01" <= month <= "12"
+    ):
+        raise ValueError(f"Invalid creation date {datetime_original!r}")
+    return year, month
+
+
+def _get_folder_destination(
+    folder_paths: Dict[str, str], destination_dir: str, datetime_original: str
+) -> str:
+    """
+    Returns the year/month directory below `destination_dir` for a `YYYY:MM:DD HH:MM:SS`
+    timestamp.
+
+    Paths are cached by the `YYYY:MM` prefix of the timestamp, so the date is validated
+    and the path joined once per month in the library rather than once per file. Raises
+    ValueError if the timestamp does not start with a valid year and month.
+    """
+    key = datetime_original[:7]
+    folder_destination = folder_paths.get(key)
+    if folder_destination is None:
+        year, month = _parse_year_month(datetime_original)
+        folder_destination = os.path.join(destination_dir, year, month)
+        folder_paths[key] = folder_destination
+    return folder_destination
+
+
+def _get_folder_contents(
+    folder_contents: Dict[str, Set[str]], folder_destination: str
+) -> Set[str]:
+    """
+    Returns the normcased file names in `folder_destination`, creating and listing the
+    directory the first time it is used in a run.
+
+    First use is serialized so that workers arriving at a new folder together create and
+    list it once instead of each doing so.
+    """
+    existing_files = folder_contents.get(folder_destination)
+    if existing_files is None:
+        with _folder_contents_lock:
+            existing_files = folder_contents.get(folder_destination)
+            if existing_files is None:
+                os.makedirs(folder_destination, exist_ok=True)
+                existing_files = {
+                    os.path.normcase(name) for name in os.listdir(folder_destination)
+                }
+                folder_contents[folder_destination] = existing_files
+    return existing_files
+
+
+def get_file_creation_date(file_path: str, file_ext: str) -> Optional[str]:
+    """
+    Returns the creation date of a file as a `YYYY:MM:DD HH:MM:SS` string.
+
+    Files with an extractor in `FILE_TYPE_EXTRACTORS` are handled by that extractor
+    alone; when it finds no date the generic EXIF parser is not tried, as these formats
+    do not carry EXIF data it can read. Files with an extension in `EXIF_EXTENSIONS` are
+    parsed for EXIF data. Files without an extension are parsed only if they start with
+    `JPEG_MAGIC`.
+
+    Parameters:
+    file_path (str): The path of the file to inspect.
+    file_ext (str): The lowercased extension of the file, including the leading dot.
+    """
+    extractor = _get_extractor(file_ext)
+    if extractor:
+        return extractor(file_path)
+    with open(file_path, "rb") as image_file:
+        if file_ext not in EXIF_EXTENSIONS:
+            if image_file.read(len(JPEG_MAGIC)) != JPEG_MAGIC:
+                return None
+            image_file.seek(0)
+        return extract_exif_data(image_file)
+
+
+def process_file(
+    file_dir: str,
+    file: str,
+    file_ext: str,
+    destination_dir: str,
+    unknown_dir: str,
+    folder_contents: Dict[str, Set[str]],
+    folder_paths: Dict[str, str],
+    same_device: bool = False,
+) -> bool:
+    """
+    Moves a single file into its year/month directory below `destination_dir`.
+
+    Files with an extension that has neither an extractor nor an entry in
+    `EXIF_EXTENSIONS` are moved to `unknown_dir` without being opened, as are files
+    whose creation date cannot be determined. Files without an extension are sniffed for
+    a JPEG header. A file whose name is already taken at its destination is removed if
+    the contents match, and stored under a name with a content hash added otherwise.
+
+    Parameters:
+    file_dir (str): The path of the file to organize.
+    file (str): The name of the file.
+    file_ext (str): The lowercased extension of the file, including the leading dot.
+    destination_dir (str): The directory to move organized photos and videos to.
+    unknown_dir (str): The existing directory to move files that cannot be organized to.
+    folder_contents (Dict[str, Set[str]]): The `os.path.normcase`d file names in each
+        destination directory used during this run, shared between workers. Each
+        directory is created and listed once; later existence checks are set lookups.
+    folder_paths (Dict[str, str]): The destination directory for each `YYYY:MM` date
+        prefix seen during this run, shared between workers.
+    same_device (bool): Whether the file and `destination_dir` share a filesystem, in
+        which case files are renamed rather than copied.
+
+    Returns:
+    bool: True if the file was organized into a dated directory, False otherwise.
+    """
+    try:
+        if (
+            file_ext
+            and file_ext not in FILE_TYPE_EXTRACTORS
+            and file_ext not in EXIF_EXTENSIONS
+        ):
+            log_and_handle_error(
+                unknown_dir,
+                file,
+                file_dir,
+                "is not a supported file type.",
+                same_device=same_device,
+            )
+            return False
+        datetime_original: Optional[str] = get_file_creation_date(file_dir, file_ext)
+        if datetime_original:
+            folder_destination = _get_folder_destination(
+                folder_paths, destination_dir, datetime_original
+            )
+            # The folder path ends in the month, never a separator, so a plain
+            # concatenation is equivalent to os.path.join here.
+            file_destination = f"{folder_destination}{os.sep}{file}"
+            existing_files = _get_folder_contents(folder_contents, folder_destination)
+            logger.debug("Moving file %s to %s", file, file_destination)
+            stored_path = move_unique_file(
+                file_dir,
+                file_destination,
+                same_device,
+                os.path.normcase(file) in existing_files,
+            )
+            existing_files.add(os.path.normcase(os.path.basename(stored_path)))
+            return True
+        log_and_handle_error(
+            unknown_dir,
+            file,
+            file_dir,
+            "has no exif data.",
+            same_device=same_device,
+        )
+    except (ValueError, UnpackError) as ex:
+        log_and_handle_error(
+            unknown_dir,
+            file,
+            file_dir,
+            "has possible bad exif data. Error: %s",
+            ex,
+            same_device=same_device,
+        )
+    except PermissionError as pe:
+        logger.error(
+            "PermissionError: Could not remove file %s at location %s. Error: %s",
+            file,
+            file_dir,
+            pe,
+        )
+        # Additional debugging information
+        logger.debug("Checking if file is closed properly.")
+        try:
+            with open(file_dir, "rb") as f:
+                pass
+        except Exception as e:
+            logger.error("Error while checking file: %s", e)
+    return False
+
+
+def _submit_bounded(
+    executor: Executor,
+    fn: Callable[..., Any],
+    args_iter: Iterable[Tuple[Any, ...]],
+    max_pending: int,
+) -> Iterator[Future]:
+    """
+    Submits `fn(*args)` to `executor` for each item of `args_iter` and yields the
+    futures as they complete.
+
+    At most `max_pending` calls are submitted and not yet yielded at any time, so
+    `args_iter` is consumed only as fast as the workers keep up and memory stays flat
+    however many items it produces.
+    """
+    pending: Set[Future] = set()
+    for args in args_iter:
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from done
+        pending.add(executor.submit(fn, *args))
+    yield from as_completed(pending)
 
 
 def organize(
-    origin_dir: Optional[str] = None, destination_dir: Optional[str] = None
+    origin_dir: Optional[str] = None,
+    destination_dir: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
 ) -> None:
     """
     Organizes photos by moving them into directories based on their creation date.
@@ -31,90 +345,67 @@ def organize(
     within a specified destination directory. The subdirectories are named after the year and month
     the photo or video was taken. If a file does not have EXIF data or its creation date cannot be
     determined, an error is logged and the file is moved to an `Unknown` directory.
+    Files are processed concurrently by a pool of worker threads as the origin directory
+    is walked, so moving starts immediately and only a bounded number of files are
+    queued at once.
 
     Parameters:
     origin_dir (Optional[str]): The directory to scan for photos and videos.
     destination_dir (Optional[str]): The directory to move organized photos and videos to.
+    max_concurrency (Optional[int]): The number of worker threads. Defaults to
+        `DEFAULT_MAX_CONCURRENCY`.
     """
     dirs: Dict[str, Any] = parse_args()
     origin_dir = origin_dir or dirs.get("origin_dir")
     destination_dir = destination_dir or dirs.get("destination_dir")
+    max_concurrency = max_concurrency or dirs.get("max_concurrency")
     logger.info("Origin Directory: %s", origin_dir)
     logger.info("Destination Directory: %s", destination_dir)
+    if not os.path.isdir(origin_dir):
+        logger.error("Origin directory %s does not exist.", origin_dir)
+        return
 
-    for root, subdirs, files in os.walk(origin_dir):
-        if not os.listdir(root):
-            os.rmdir(root)
-            print(f"Removing directory {root}")
-        for file in files:
-            file_dir = os.path.join(root, file)
-            if file in {"Thumbs.db", "desktop"}:
-                os.remove(file_dir)
-                continue
-            print(f"At file: {file_dir}")
-            try:
-                datetime_original: Optional[str] = None
-                if file.lower().endswith(".mov"):
-                    datetime_original = extract_mov_creation_date(file_dir)
-                elif file.lower().endswith(".png"):
-                    datetime_original = extract_png_creation_date(file_dir)
-                elif file.lower().endswith(".avi"):
-                    datetime_original = extract_avi_creation_date(file_dir)
-                elif file.lower().endswith(".mp4"):
-                    datetime_original = extract_mp4_creation_date(file_dir)
-                elif file.lower().endswith(".3gp"):
-                    datetime_original = extract_3gp_creation_date(file_dir)
-                elif file.lower().endswith(".gif"):
-                    datetime_original = extract_gif_creation_date(file_dir)
-                elif file.lower().endswith(".m4v"):
-                    datetime_original = extract_m4v_creation_date(file_dir)
-                else:
-                    with open(file_dir, "rb") as image_file:
-                        datetime_original = extract_exif_data(image_file)
-
-                if datetime_original:
-                    date: datetime = datetime.strptime(
-                        datetime_original, "%Y:%m:%d %H:%M:%S"
-                    )
-                    year: int = date.year
-                    month: str = str(date.month).zfill(2)
-                    folder_destination: str = os.path.join(
-                        destination_dir, str(year), month
-                    )
-                    file_destination: str = os.path.join(folder_destination, file)
-                    if not os.path.exists(folder_destination):
-                        os.makedirs(folder_destination)
-                    if not os.path.exists(file_destination):
-                        logger.debug("Moving file %s to %s", file, file_destination)
-                        shutil.copy(file_dir, file_destination)
-                        os.remove(file_dir)
-                    else:
-                        os.remove(file_dir)
-                else:
-                    log_and_handle_error(
-                        destination_dir,
-                        file,
-                        file_dir,
-                        f"File {file} at location {file_dir} has no exif data.",
-                    )
-            except (ValueError, UnpackError) as ex:
-                log_and_handle_error(
-                    destination_dir,
-                    file,
+    count = 0
+    organized_count = 0
+    last_progress = time.monotonic()
+    folder_contents: Dict[str, Set[str]] = {}
+    folder_paths: Dict[str, str] = {}
+    unknown_dir = os.path.join(destination_dir, UNKNOWN_DIR_NAME)
+    os.makedirs(unknown_dir, exist_ok=True)
+    same_device = is_same_device(origin_dir, destination_dir)
+    workers = max_concurrency or DEFAULT_MAX_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        completed = _submit_bounded(
+            executor,
+            process_file,
+            (
+                (
                     file_dir,
-                    f"File {file} at location {file_dir} has possible bad exif data. Error: {ex}",
-                )
-            except PermissionError as pe:
-                logger.error(
-                    "PermissionError: Could not remove file %s at location %s. Error: %s",
                     file,
-                    file_dir,
-                    pe,
+                    file_ext,
+                    destination_dir,
+                    unknown_dir,
+                    folder_contents,
+                    folder_paths,
+                    same_device,
                 )
-                # Additional debugging information
-                logger.debug("Checking if file is closed properly.")
-                try:
-                    with open(file_dir, "rb") as f:
-                        pass
-                except Exception as e:
-                    logger.error("Error while checking file: %s", e)
+                for file_dir, file, file_ext in _iter_files(origin_dir)
+            ),
+            workers * PENDING_FILES_PER_WORKER,
+        )
+        for count, future in enumerate(completed, 1):
+            organized_count += future.result()
+            if (
+                count % PROGRESS_EVERY_FILES == 0
+                or time.monotonic() - last_progress >= PROGRESS_EVERY_SECONDS
+            ):
+                logger.info("Processed %d files", count)
+                last_progress = time.monotonic()
+
+    logger.info(
+        "Processed %d files, %d organized by date, %d not organized",
+        count,
+        organized_count,
+        count - organized_count,
+    )
+    _remove_empty_dirs(origin_dir)
@@ -0,0 +1,70 @@
+import io
+
+from PIL import Image as PILImage
+
+from photo_organizer.exif import EXIF_HEADER_BYTES, extract_exif_data
+
+
+def make_jpeg(datetime_original=None, trailing_bytes=0):
+    exif = PILImage.Exif()
+    if datetime_original:
+        exif[0x8769] = {0x9003: datetime_original}
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (8, 8)).save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue() + b"\x00" * trailing_bytes
+
+
+def test_extract_exif_data_datetime_original():
+    image_file = io.BytesIO(make_jpeg("2023:01:01 12:00:00"))
+    assert extract_exif_data(image_file) == "2023:01:01 12:00:00"
+
+
+def test_extract_exif_data_reads_only_header():
+    image_file = io.BytesIO(make_jpeg("2023:01:01 12:00:00", 4 * EXIF_HEADER_BYTES))
+    assert extract_exif_data(image_file) == "2023:01:01 12:00:00"
+    assert image_file.tell() == EXIF_HEADER_BYTES
+
+
+def test_extract_exif_data_exif_beyond_header():
+    jpeg = make_jpeg("2023:01:01 12:00:00")
+    padding = b"\xff\xe2" + b"\x00" * (EXIF_HEADER_BYTES + 2)
+    image_file = io.BytesIO(jpeg[:2] + padding + jpeg[2:])
+    assert extract_exif_data(image_file) == "2023:01:01 12:00:00"
+
+
+def test_extract_exif_data_no_exif():
+    image_file = io.BytesIO(b"dummy data")
+    assert extract_exif_data(image_file) is None
+
+
+def test_extract_exif_data_datetime_digitized():
+    exif = PILImage.Exif()
+    exif[0x8769] = {0x9004: "2022:02:02 08:00:00"}
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (8, 8)).save(buffer, "JPEG", exif=exif)
+    buffer.seek(0)
+    assert extract_exif_data(buffer) == "2022:02:02 08:00:00"
+
+
+def test_extract_exif_data_big_endian():
+    tiff = (
+        b"MM\x00\x2a\x00\x00\x00\x08"
+        + b"\x00\x01"
+        + b"\x87\x69\x00\x04\x00\x00\x00\x01\x00\x00\x00\x1a"
+        + b"\x00\x00\x00\x00"
+        + b"\x00\x01"
+        + b"\x90\x03\x00\x02\x00\x00\x00\x14\x00\x00\x00\x2c"
+        + b"\x00\x00\x00\x00"
+        + b"2021:03:04 05:06:07\x00"
+    )
+    app1 = b"Exif\x00\x00" + tiff
+    jpeg = b"\xff\xd8\xff\xe1" + (len(app1) + 2).to_bytes(2, "big") + app1 + b"\xff\xd9"
+    assert extract_exif_data(io.BytesIO(jpeg)) == "2021:03:04 05:06:07"
+
+
+def test_extract_exif_data_jpeg_without_exif_reads_only_header():
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (8, 8)).save(buffer, "JPEG")
+    image_file = io.BytesIO(buffer.getvalue() + b"\x00" * 4 * EXIF_HEADER_BYTES)
+    assert extract_exif_data(image_file) is None
+    assert image_file.tell() == EXIF_HEADER_BYTES
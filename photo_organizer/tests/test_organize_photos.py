@@ -1,11 +1,17 @@
 import os
 import shutil
 import tempfile
-from unittest.mock import patch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from photo_organizer.organize_photos import organize
+from photo_organizer.organize_photos import (
+    FILE_TYPE_EXTRACTORS,
+    _submit_bounded,
+    organize,
+)
 
 
 @pytest.fixture
@@ -20,22 +26,20 @@ def setup_dirs():
 
 
 @patch("photo_organizer.organize_photos.parse_args")
-@patch("photo_organizer.organize_photos.extract_mov_creation_date")
-def test_move_files_to_correct_destination(
-    mock_extract_mov_creation_date, mock_parse_args, setup_dirs
-):
+def test_move_files_to_correct_destination(mock_parse_args, setup_dirs):
     origin_dir, destination_dir = setup_dirs
     mock_parse_args.return_value = {
         "origin_dir": origin_dir,
         "destination_dir": destination_dir,
     }
-    mock_extract_mov_creation_date.return_value = "2023:01:01 12:00:00"
+    mock_extract_mov_creation_date = MagicMock(return_value="2023:01:01 12:00:00")
 
     test_file = os.path.join(origin_dir, "test.mov")
     with open(test_file, "w") as f:
         f.write("dummy data")
 
-    organize()
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".mov": mock_extract_mov_creation_date}):
+        organize()
 
     expected_dir = os.path.join(destination_dir, "2023", "01")
     expected_file = os.path.join(expected_dir, "test.mov")
@@ -61,6 +65,19 @@ def test_remove_empty_directories(mock_parse_args, setup_dirs):
     assert not os.path.exists(empty_dir)
 
 
+@patch("photo_organizer.organize_photos.parse_args")
+def test_missing_origin_directory(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": os.path.join(origin_dir, "missing"),
+        "destination_dir": destination_dir,
+    }
+
+    organize()
+
+    assert os.listdir(destination_dir) == []
+
+
 @patch("photo_organizer.organize_photos.parse_args")
 def test_delete_specific_files(mock_parse_args, setup_dirs):
     origin_dir, destination_dir = setup_dirs
@@ -82,6 +99,24 @@ def test_delete_specific_files(mock_parse_args, setup_dirs):
     assert not os.path.exists(desktop_file)
 
 
+@patch("photo_organizer.organize_photos.parse_args")
+def test_delete_specific_files_ignores_case(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+
+    for name in ("THUMBS.DB", ".DS_Store", "Desktop"):
+        with open(os.path.join(origin_dir, name), "w") as f:
+            f.write("dummy data")
+
+    organize()
+
+    assert os.listdir(origin_dir) == []
+    assert os.listdir(os.path.join(destination_dir, "Unknown")) == []
+
+
 @patch("photo_organizer.organize_photos.parse_args")
 @patch("photo_organizer.organize_photos.extract_exif_data")
 @patch("photo_organizer.organize_photos.log_and_handle_error")
@@ -127,10 +162,11 @@ def test_handle_files_with_bad_exif_data(
 
 
 @patch("photo_organizer.organize_photos.parse_args")
+@patch("photo_organizer.organize_photos.os.replace")
 @patch("photo_organizer.organize_photos.os.remove")
 @patch("photo_organizer.organize_photos.logger.error")
 def test_handle_permission_error(
-    mock_logger_error, mock_os_remove, mock_parse_args, setup_dirs
+    mock_logger_error, mock_os_remove, mock_os_replace, mock_parse_args, setup_dirs
 ):
     origin_dir, destination_dir = setup_dirs
     mock_parse_args.return_value = {
@@ -138,6 +174,7 @@ def test_handle_permission_error(
         "destination_dir": destination_dir,
     }
     mock_os_remove.side_effect = PermissionError("Permission denied")
+    mock_os_replace.side_effect = PermissionError("Permission denied")
 
     test_file = os.path.join(origin_dir, "test.jpg")
     with open(test_file, "w") as f:
@@ -146,3 +183,237 @@ def test_handle_permission_error(
     organize()
 
     mock_logger_error.assert_called()
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+@patch("photo_organizer.organize_photos.os.replace")
+@patch("photo_organizer.organize_photos.os.remove")
+@patch("photo_organizer.organize_photos.logger.error")
+def test_handle_permission_error_unsupported_file(
+    mock_logger_error, mock_os_remove, mock_os_replace, mock_parse_args, setup_dirs
+):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_os_remove.side_effect = PermissionError("Permission denied")
+    mock_os_replace.side_effect = PermissionError("Permission denied")
+
+    for name in ("a.txt", "b.jpg"):
+        with open(os.path.join(origin_dir, name), "w") as f:
+            f.write("dummy data")
+
+    organize()
+
+    logged_files = [call.args[1] for call in mock_logger_error.call_args_list]
+    assert "a.txt" in logged_files
+    assert "b.jpg" in logged_files
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+@patch("photo_organizer.organize_photos.extract_exif_data")
+def test_extractor_result_is_not_retried_with_exif(
+    mock_extract_exif_data, mock_parse_args, setup_dirs
+):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_extract_png_creation_date = MagicMock(return_value=None)
+
+    test_file = os.path.join(origin_dir, "test.png")
+    with open(test_file, "w") as f:
+        f.write("dummy data")
+
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".png": mock_extract_png_creation_date}):
+        organize()
+
+    mock_extract_exif_data.assert_not_called()
+    assert os.path.exists(os.path.join(destination_dir, "Unknown", "test.png"))
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+def test_remove_directories_emptied_by_moves(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_extract_mov_creation_date = MagicMock(return_value="2023:01:01 12:00:00")
+
+    nested_dir = os.path.join(origin_dir, "album", "day1")
+    os.makedirs(nested_dir)
+    with open(os.path.join(nested_dir, "test.mov"), "w") as f:
+        f.write("dummy data")
+
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".mov": mock_extract_mov_creation_date}):
+        organize()
+
+    assert not os.path.exists(os.path.join(origin_dir, "album"))
+    assert os.path.exists(origin_dir)
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+def test_move_many_files_concurrently(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+        "max_concurrency": 4,
+    }
+    mock_extract_mov_creation_date = MagicMock(return_value="2023:01:01 12:00:00")
+
+    for i in range(20):
+        with open(os.path.join(origin_dir, f"test{i}.mov"), "w") as f:
+            f.write("dummy data")
+
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".mov": mock_extract_mov_creation_date}):
+        organize()
+
+    expected_dir = os.path.join(destination_dir, "2023", "01")
+    assert sorted(os.listdir(expected_dir)) == sorted(f"test{i}.mov" for i in range(20))
+    assert not os.listdir(origin_dir)
+
+
+def test_submit_bounded_limits_pending_files():
+    pending = 0
+    max_seen = 0
+    lock = threading.Lock()
+
+    def args_iter():
+        nonlocal pending, max_seen
+        for i in range(50):
+            with lock:
+                pending += 1
+                max_seen = max(max_seen, pending)
+            yield (i,)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = []
+        for future in _submit_bounded(executor, lambda i: i, args_iter(), 3):
+            results.append(future.result())
+            with lock:
+                pending -= 1
+
+    assert sorted(results) == list(range(50))
+    assert max_seen <= 4
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+def test_handle_files_with_invalid_date(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_extract_mov_creation_date = MagicMock(return_value="0000:00:00 00:00:00")
+
+    test_file = os.path.join(origin_dir, "test.mov")
+    with open(test_file, "w") as f:
+        f.write("dummy data")
+
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".mov": mock_extract_mov_creation_date}):
+        organize()
+
+    assert os.path.exists(os.path.join(destination_dir, "Unknown", "test.mov"))
+    assert not os.path.exists(test_file)
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+def test_existing_destination_file_is_kept(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_extract_mov_creation_date = MagicMock(return_value="2023:01:01 12:00:00")
+
+    expected_dir = os.path.join(destination_dir, "2023", "01")
+    os.makedirs(expected_dir)
+    with open(os.path.join(expected_dir, "test.mov"), "w") as f:
+        f.write("original data")
+    test_file = os.path.join(origin_dir, "test.mov")
+    with open(test_file, "w") as f:
+        f.write("dummy data")
+
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".mov": mock_extract_mov_creation_date}):
+        organize()
+
+    with open(os.path.join(expected_dir, "test.mov")) as f:
+        assert f.read() == "original data"
+    assert not os.path.exists(test_file)
+    (renamed_file,) = set(os.listdir(expected_dir)) - {"test.mov"}
+    assert renamed_file.startswith("test_") and renamed_file.endswith(".mov")
+    with open(os.path.join(expected_dir, renamed_file)) as f:
+        assert f.read() == "dummy data"
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+def test_duplicate_file_is_removed(mock_parse_args, setup_dirs):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_extract_mov_creation_date = MagicMock(return_value="2023:01:01 12:00:00")
+
+    expected_dir = os.path.join(destination_dir, "2023", "01")
+    os.makedirs(expected_dir)
+    with open(os.path.join(expected_dir, "test.mov"), "w") as f:
+        f.write("dummy data")
+    test_file = os.path.join(origin_dir, "test.mov")
+    with open(test_file, "w") as f:
+        f.write("dummy data")
+
+    with patch.dict(FILE_TYPE_EXTRACTORS, {".mov": mock_extract_mov_creation_date}):
+        organize()
+
+    assert os.listdir(expected_dir) == ["test.mov"]
+    assert not os.path.exists(test_file)
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+@patch("photo_organizer.organize_photos.extract_exif_data")
+def test_unsupported_files_are_not_opened(
+    mock_extract_exif_data, mock_parse_args, setup_dirs
+):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+
+    test_file = os.path.join(origin_dir, "notes.txt")
+    with open(test_file, "w") as f:
+        f.write("dummy data")
+
+    organize()
+
+    mock_extract_exif_data.assert_not_called()
+    assert os.path.exists(os.path.join(destination_dir, "Unknown", "notes.txt"))
+
+
+@patch("photo_organizer.organize_photos.parse_args")
+@patch("photo_organizer.organize_photos.extract_exif_data")
+def test_files_without_extension_are_sniffed(
+    mock_extract_exif_data, mock_parse_args, setup_dirs
+):
+    origin_dir, destination_dir = setup_dirs
+    mock_parse_args.return_value = {
+        "origin_dir": origin_dir,
+        "destination_dir": destination_dir,
+    }
+    mock_extract_exif_data.return_value = "2023:01:01 12:00:00"
+
+    with open(os.path.join(origin_dir, "IMG_0001"), "wb") as f:
+        f.write(b"\xff\xd8\xff\xe1dummy data")
+    with open(os.path.join(origin_dir, "README"), "w") as f:
+        f.write("dummy data")
+
+    organize()
+
+    mock_extract_exif_data.assert_called_once()
+    assert os.path.exists(os.path.join(destination_dir, "2023", "01", "IMG_0001"))
+    assert os.path.exists(os.path.join(destination_dir, "Unknown", "README"))
@@ -0,0 +1,32 @@
+from PIL import Image as PILImage
+from PIL.PngImagePlugin import PngInfo
+
+from photo_organizer.file_types.png import extract_png_creation_date
+
+
+def make_png(path, datetime_original=None, creation_time=None):
+    exif = PILImage.Exif()
+    if datetime_original:
+        exif[0x8769] = {0x9003: datetime_original}
+    pnginfo = PngInfo()
+    if creation_time:
+        pnginfo.add_text("creation_time", creation_time)
+    PILImage.new("RGB", (8, 8)).save(path, "PNG", exif=exif, pnginfo=pnginfo)
+
+
+def test_extract_png_creation_date_from_exif(tmp_path):
+    image = tmp_path / "test.png"
+    make_png(image, datetime_original="2023:01:01 12:00:00")
+    assert extract_png_creation_date(str(image)) == "2023:01:01 12:00:00"
+
+
+def test_extract_png_creation_date_from_text_chunk(tmp_path):
+    image = tmp_path / "test.png"
+    make_png(image, creation_time="2020:05:05 05:05:05")
+    assert extract_png_creation_date(str(image)) == "2020:05:05 05:05:05"
+
+
+def test_extract_png_creation_date_none(tmp_path):
+    image = tmp_path / "test.png"
+    make_png(image)
+    assert extract_png_creation_date(str(image)) is None
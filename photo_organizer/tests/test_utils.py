@@ -1,4 +1,10 @@
-from photo_organizer.utils import parse_args
+import errno
+import os
+from unittest.mock import patch
+
+import pytest
+
+from photo_organizer.utils import _get_parser, move_file, move_unique_file, parse_args
 
 
 def test_parse_args_defaults(monkeypatch):
@@ -8,6 +14,16 @@ def test_parse_args_defaults(monkeypatch):
     assert args["destination_dir"] == r"C:/Users/sherd/Documents/Sorted_Pics"
 
 
+def test_parse_args_defaults_match_parser(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["program_name"])
+    defaults = _get_parser().parse_args([])
+    assert parse_args() == {
+        "origin_dir": defaults.origin,
+        "destination_dir": defaults.destination,
+        "max_concurrency": defaults.max_concurrency,
+    }
+
+
 def test_parse_args_custom_origin(monkeypatch):
     monkeypatch.setattr("sys.argv", ["program_name", "--origin", "/custom/origin"])
     args = parse_args()
@@ -38,3 +54,113 @@ def test_parse_args_custom_both(monkeypatch):
     args = parse_args()
     assert args["origin_dir"] == "/custom/origin"
     assert args["destination_dir"] == "/custom/destination"
+
+
+def test_parse_args_max_concurrency(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["program_name", "--max-concurrency", "4"])
+    args = parse_args()
+    assert args["max_concurrency"] == 4
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "four"])
+def test_parse_args_rejects_invalid_max_concurrency(monkeypatch, capsys, value):
+    monkeypatch.setattr("sys.argv", ["program_name", "--max-concurrency", value])
+    with pytest.raises(SystemExit):
+        parse_args()
+    assert "is not a positive integer" in capsys.readouterr().err
+
+
+def test_parse_args_accepts_use_gevent(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["program_name", "--use-gevent"])
+    args = parse_args()
+    assert args["origin_dir"] == r"C:/Users/sherd/Documents/Unsorted_Pics"
+
+
+@pytest.mark.parametrize("same_device", [True, False])
+def test_move_file(tmp_path, same_device):
+    source = tmp_path / "source.jpg"
+    source.write_text("dummy data")
+    destination = tmp_path / "destination.jpg"
+
+    move_file(str(source), str(destination), same_device)
+
+    assert not os.path.exists(source)
+    assert destination.read_text() == "dummy data"
+
+
+@pytest.mark.parametrize("same_device", [True, False])
+def test_move_file_does_not_overwrite(tmp_path, same_device):
+    source = tmp_path / "source.jpg"
+    source.write_text("dummy data")
+    destination = tmp_path / "destination.jpg"
+    destination.write_text("original data")
+
+    with pytest.raises(FileExistsError):
+        move_file(str(source), str(destination), same_device)
+
+    assert source.read_text() == "dummy data"
+    assert destination.read_text() == "original data"
+
+
+def test_move_file_across_mounts_on_same_device(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_text("dummy data")
+    destination = tmp_path / "destination.jpg"
+    cross_device = OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    with patch("photo_organizer.utils.os.link", side_effect=cross_device), patch(
+        "photo_organizer.utils.os.rename", side_effect=cross_device
+    ):
+        move_file(str(source), str(destination), True)
+
+    assert not os.path.exists(source)
+    assert destination.read_text() == "dummy data"
+
+
+def test_move_unique_file_removes_duplicate(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_text("dummy data")
+    destination = tmp_path / "destination.jpg"
+    destination.write_text("dummy data")
+
+    stored_path = move_unique_file(str(source), str(destination), True)
+
+    assert stored_path == str(destination)
+    assert not os.path.exists(source)
+    assert os.listdir(tmp_path) == ["destination.jpg"]
+
+
+@pytest.mark.parametrize("same_device", [True, False])
+def test_move_unique_file_keeps_different_file(tmp_path, same_device):
+    source = tmp_path / "source.jpg"
+    source.write_text("dummy data")
+    destination = tmp_path / "destination.jpg"
+    destination.write_text("original data")
+
+    stored_path = move_unique_file(str(source), str(destination), same_device)
+
+    assert not os.path.exists(source)
+    assert destination.read_text() == "original data"
+    assert os.path.basename(stored_path).startswith("destination_")
+    with open(stored_path) as f:
+        assert f.read() == "dummy data"
+
+
+def test_move_unique_file_keeps_file_with_colliding_hashed_name(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_text("dummy data")
+    destination = tmp_path / "destination.jpg"
+    destination.write_text("original data")
+    hashed_name = move_unique_file(str(source), str(destination), True)
+    with open(hashed_name, "w") as f:
+        f.write("unrelated data")
+    source.write_text("dummy data")
+
+    stored_path = move_unique_file(str(source), str(destination), True)
+
+    assert stored_path != hashed_name
+    assert not os.path.exists(source)
+    with open(hashed_name) as f:
+        assert f.read() == "unrelated data"
+    with open(stored_path) as f:
+        assert f.read() == "dummy data"
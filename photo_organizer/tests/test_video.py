@@ -0,0 +1,79 @@
+import struct
+from unittest.mock import patch
+
+from photo_organizer.file_types.video import (
+    _extract_hachoir_creation_date,
+    extract_video_creation_date,
+)
+
+# 2023-01-01 12:00:00 in seconds since 1904-01-01.
+CREATION_TIME = 3755419200
+
+
+def box(box_type, payload):
+    return struct.pack(">I4s", len(payload) + 8, box_type) + payload
+
+
+def make_mov(creation_time, version=0):
+    if version == 1:
+        times = struct.pack(">QQIQ", creation_time, creation_time, 600, 0)
+    else:
+        times = struct.pack(">IIII", creation_time, creation_time, 600, 0)
+    mvhd = box(
+        b"mvhd",
+        bytes([version, 0, 0, 0])
+        + times
+        + struct.pack(">IH", 0x00010000, 0x0100)
+        + b"\x00" * 10
+        + struct.pack(">9I", 0x00010000, 0, 0, 0, 0x00010000, 0, 0, 0, 0x40000000)
+        + b"\x00" * 24
+        + struct.pack(">I", 2),
+    )
+    return (
+        box(b"ftyp", b"qt  \x00\x00\x02\x00qt  ")
+        + box(b"mdat", b"\x00" * 1024)
+        + box(b"moov", mvhd)
+    )
+
+
+def test_extract_video_creation_date(tmp_path):
+    video = tmp_path / "test.mov"
+    video.write_bytes(make_mov(CREATION_TIME))
+    assert extract_video_creation_date(str(video)) == "2023:01:01 12:00:00"
+
+
+def test_extract_video_creation_date_matches_hachoir(tmp_path):
+    video = tmp_path / "test.mov"
+    video.write_bytes(make_mov(CREATION_TIME))
+    assert extract_video_creation_date(str(video)) == _extract_hachoir_creation_date(
+        str(video)
+    )
+
+
+def test_extract_video_creation_date_version_1(tmp_path):
+    video = tmp_path / "test.mp4"
+    video.write_bytes(make_mov(CREATION_TIME, version=1))
+    assert extract_video_creation_date(str(video)) == "2023:01:01 12:00:00"
+
+
+def test_extract_video_creation_date_unset(tmp_path):
+    video = tmp_path / "test.mov"
+    video.write_bytes(make_mov(0))
+    assert extract_video_creation_date(str(video)) is None
+
+
+def test_extract_video_creation_date_out_of_range(tmp_path):
+    video = tmp_path / "test.mp4"
+    video.write_bytes(make_mov(2**63, version=1))
+    assert extract_video_creation_date(str(video)) is None
+
+
+@patch("photo_organizer.file_types.video._extract_hachoir_creation_date")
+def test_extract_video_creation_date_falls_back_to_hachoir(
+    mock_extract_hachoir_creation_date, tmp_path
+):
+    mock_extract_hachoir_creation_date.return_value = "2020:05:05 05:05:05"
+    video = tmp_path / "test.avi"
+    video.write_bytes(b"RIFF\x00\x00\x00\x00AVI LIST")
+    assert extract_video_creation_date(str(video)) == "2020:05:05 05:05:05"
+    mock_extract_hachoir_creation_date.assert_called_once_with(str(video))
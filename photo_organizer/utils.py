@@ -1,27 +1,222 @@
-import argparse
+import errno
+import hashlib
 import logging
-from typing import Dict
+import os
+import shutil
+import sys
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    import argparse
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ORIGIN_DIR = r"C:/Users/sherd/Documents/Unsorted_Pics"
+DEFAULT_DESTINATION_DIR = r"C:/Users/sherd/Documents/Sorted_Pics"
+
+HASH_CHUNK_BYTES = 1024 * 1024
+# Hex digits of the content hash added to a file name that collides with another file.
+SHORT_HASH_LENGTH = 8
+
+
+def _positive_int(value: str) -> int:
+    import argparse
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive integer")
+    return number
+
+
+def _get_parser() -> "argparse.ArgumentParser":
+    """
+    Builds the command line parser, importing argparse on first use.
+    """
+    import argparse
 
-def parse_args() -> Dict[str, str]:
     parser = argparse.ArgumentParser(description="Organize photos by EXIF data.")
     parser.add_argument(
         "-o",
         "--origin",
         type=str,
-        default=r"C:/Users/sherd/Documents/Unsorted_Pics",
+        default=DEFAULT_ORIGIN_DIR,
         help="Path to the origin directory containing photos.",
     )
     parser.add_argument(
         "-d",
         "--destination",
         type=str,
-        default=r"C:/Users/sherd/Documents/Sorted_Pics",
+        default=DEFAULT_DESTINATION_DIR,
         help="Path to the destination directory where photos will be organized.",
     )
+    parser.add_argument(
+        "-c",
+        "--max-concurrency",
+        type=_positive_int,
+        default=None,
+        help="Number of files to process concurrently (default: 4 per CPU, max 32).",
+    )
+    parser.add_argument(
+        "--use-gevent",
+        action="store_true",
+        help="Monkey-patch the standard library with gevent before starting (run.py).",
+    )
+    return parser
+
+
+def parse_args() -> Dict[str, Any]:
+    if len(sys.argv) == 1:
+        # Nothing to parse, so skip importing argparse and building the parser.
+        return {
+            "origin_dir": DEFAULT_ORIGIN_DIR,
+            "destination_dir": DEFAULT_DESTINATION_DIR,
+            "max_concurrency": None,
+        }
+    args = _get_parser().parse_args()
+
+    return {
+        "origin_dir": args.origin,
+        "destination_dir": args.destination,
+        "max_concurrency": args.max_concurrency,
+    }
+
+
+def is_same_device(origin_dir: str, destination_dir: str) -> bool:
+    """
+    Returns True if both directories live on the same filesystem, so files can be
+    renamed between them instead of copied.
+    """
+    return os.stat(origin_dir).st_dev == os.stat(destination_dir).st_dev
+
+
+def _rename_no_clobber(file_dir: str, file_destination: str) -> None:
+    if os.name == "nt":
+        os.rename(file_dir, file_destination)
+        return
+    try:
+        os.link(file_dir, file_destination)
+    except OSError as e:
+        if isinstance(e, FileExistsError) or e.errno == errno.EXDEV:
+            raise
+        # Hard links are not supported here (e.g. FAT or SMB mounts).
+        if os.path.exists(file_destination):
+            raise FileExistsError(
+                errno.EEXIST, os.strerror(errno.EEXIST), file_destination
+            )
+        os.replace(file_dir, file_destination)
+        return
+    os.remove(file_dir)
+
+
+def move_file(file_dir: str, file_destination: str, same_device: bool) -> None:
+    """
+    Moves `file_dir` to `file_destination` without overwriting an existing file.
+
+    Raises FileExistsError, leaving `file_dir` in place, if `file_destination` already
+    exists. The existence check is part of the move itself rather than a separate
+    `stat`, so two workers moving files with the same name cannot overwrite each other.
+
+    On the same filesystem this is a rename (Windows refuses to rename over a file) or
+    a hard link followed by removing the original. Otherwise, or if the rename fails
+    because the file is on another mount below the origin directory, the destination is
+    claimed with an exclusive create and the contents are copied with
+    `shutil.copyfile`, which uses the platform's zero-copy path where available
+    (sendfile on Linux) and skips the permission-bit copy `shutil.copy` adds, and the
+    original is removed.
+    """
+    if same_device:
+        try:
+            _rename_no_clobber(file_dir, file_destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+    open(file_destination, "xb").close()
+    try:
+        shutil.copyfile(file_dir, file_destination)
+    except BaseException:
+        os.remove(file_destination)
+        raise
+    os.remove(file_dir)
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Returns the hex SHA-256 digest of a file, read in `HASH_CHUNK_BYTES` chunks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _has_contents(file_path: str, source_path: str, source_digest: str) -> bool:
+    """
+    Returns True if `file_path` holds the same bytes as `source_path`, whose SHA-256
+    digest is `source_digest`. `file_path` is only hashed when the sizes match.
+    """
+    try:
+        if os.path.getsize(file_path) != os.path.getsize(source_path):
+            return False
+        return file_digest(file_path) == source_digest
+    except FileNotFoundError:
+        return False
+
+
+def move_unique_file(
+    file_dir: str,
+    file_destination: str,
+    same_device: bool,
+    destination_exists: bool = False,
+) -> str:
+    """
+    Moves `file_dir` to `file_destination`, keeping both files if the name is taken.
+
+    If a file already exists at `file_destination` with the same contents, `file_dir`
+    is a duplicate and is removed. If the contents differ, `file_dir` is moved alongside
+    it with the start of its SHA-256 digest added to the name, e.g.
+    `IMG_0001_1a2b3c4d.jpg`, followed by a counter (`IMG_0001_1a2b3c4d_1.jpg`) if that
+    name holds different contents too. Existing files are only hashed when their size
+    matches, and `file_dir` is only removed once a file with identical contents has
+    been found.
 
-    args = parser.parse_args()
+    Parameters:
+    file_dir (str): The path of the file to move.
+    file_destination (str): The path to move the file to.
+    same_device (bool): Whether both paths share a filesystem; passed to `move_file`.
+    destination_exists (bool): Whether `file_destination` is already known to exist, in
+        which case the plain move is not attempted.
 
-    return {"origin_dir": args.origin, "destination_dir": args.destination}
+    Returns:
+    str: The path the file's contents are stored at after the move.
+    """
+    if not destination_exists:
+        try:
+            move_file(file_dir, file_destination, same_device)
+            return file_destination
+        except FileExistsError:
+            pass
+    source_digest = file_digest(file_dir)
+    root, ext = os.path.splitext(file_destination)
+    unique_root = f"{root}_{source_digest[:SHORT_HASH_LENGTH]}"
+    candidate = file_destination
+    attempt = 0
+    while True:
+        if _has_contents(candidate, file_dir, source_digest):
+            logger.debug("Removing duplicate file %s of %s", file_dir, candidate)
+            os.remove(file_dir)
+            return candidate
+        candidate = (
+            f"{unique_root}_{attempt}{ext}" if attempt else f"{unique_root}{ext}"
+        )
+        attempt += 1
+        try:
+            logger.debug("Moving file %s to %s", file_dir, candidate)
+            move_file(file_dir, candidate, same_device)
+            return candidate
+        except FileExistsError:
+            pass
@@ -1,7 +1,12 @@
 #!/usr/bin/env python
-from gevent import monkey
+import sys
 
-monkey.patch_all(thread=False)
+# Photos are read and moved on local disk, so gevent is opt-in for setups where the
+# origin or destination is reached over the network.
+if "--use-gevent" in sys.argv:
+    from gevent import monkey
+
+    monkey.patch_all(thread=False)
 
 if __name__ == "__main__":
     from photo_organizer import main